@@ -15,40 +15,85 @@ import time
 import struct
 import gc
 import math
+import micropython
+from micropython import const
 from pyb import UART
 
 # ----------------- 2. 初始化与全局配置 -----------------
 # 初始化串口
 uart = UART(3, 115200, timeout_char=100)
+# 发送忙检测：部分固件的 pyb.UART 没有 txdone()，此时不做该检查
+_uart_txdone = uart.txdone if hasattr(uart, "txdone") else None
 
 # 延迟时间配置
 STANDARD_SEND_INTERVAL_MS = 30  # 标准模式延迟
 CIRCLE_SEND_INTERVAL_MS = 50    # 圆周模式延迟
 current_send_interval_ms = STANDARD_SEND_INTERVAL_MS
 last_uart_send_time = 0
+last_sent_coord = 0        # 最近一次实际写入串口的打包坐标 (x << 8) | y
 
-# 分辨率设置 (HQVGA: 240x160)
-ACTIVE_RESOLUTION = sensor.HQVGA
-SCREEN_WIDTH, SCREEN_HEIGHT = 240, 160
+# 分辨率设置 (QQVGA: 160x120，帧数据量约为 HQVGA 的一半)
+ACTIVE_RESOLUTION = sensor.QQVGA
+SCREEN_WIDTH, SCREEN_HEIGHT = 160, 120
 SCREEN_CENTER_X, SCREEN_CENTER_Y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+SCREEN_CENTER = (SCREEN_CENTER_X, SCREEN_CENTER_Y)
 
-# 二值化参数
-BLACK_THRESHOLD = (0, 20)      # 黑色区域阈值范围
-BINARY_AREA_THRESHOLD = 2000   # 最小面积阈值
-BINARY_PIXELS_THRESHOLD = 300  # 最小像素数阈值
+# 串口协议坐标系 (沿用 HQVGA: 240x160)，发送前由图像坐标等比换算
+OUTPUT_WIDTH, OUTPUT_HEIGHT = 240, 160
+
+# 矩形检测参数
+RECT_MAGNITUDE_THRESHOLD = 10000  # find_rects 边缘强度阈值
+RECT_AREA_THRESHOLD = 1000        # 最小外接矩形面积阈值（HQVGA 下为 2000）
+RECT_AREA_VERY_LARGE = SCREEN_WIDTH * SCREEN_HEIGHT * 3 // 4  # 超大候选面积（画面的75%）
+
+# 检测结果缓存（时间降采样）：目标稳定时跳过若干帧的矩形检测
+RECT_CACHE_MAX_AGE = 3      # 稳定后最多连续复用的帧数
+RECT_STABLE_PIXELS = 2      # 相邻两次检测外接矩形各分量差值不超过该值视为稳定
+_cached_rect = None         # 可复用的检测结果
+_cached_age = 0             # 已复用的帧数
+_last_detected_rect = None  # 上一次实际检测得到的外接矩形 (x, y, w, h)
+
+# 角度常量
+PI = math.pi
+TWO_PI = 2 * math.pi
 
 # 圆轨迹控制参数
-current_angle = 0           # 当前角度（弧度）
+current_angle = 0           # 当前角度（Q16 定点：0~65535 对应 0~2π）
 circle_start_time = None    # 圆周运动开始时间
 target_circle_time = 15000  # 完成一圈的目标时间(毫秒)
+# 每毫秒对应的 Q16 角度增量（Q12 定点），以乘法和移位代替每次发送时的除法
+_ANGLE_Q16_PER_MS_Q12 = (1 << 28) // target_circle_time
 last_target_point = None    # 上一个目标点
-smooth_factor = 0.7         # 平滑因子，越大越平滑
+
+# 定点运算参数（Q16：65536 表示 1.0 或一整圈）
+_ANGLE_Q16_HALF_TURN = const(0x8000)
+_ANGLE_Q16_MASK = const(0xFFFF)
+_ANGLE_GAIN_Q16 = const(19661)    # 角度跟随增益 0.3
+_SMOOTH_NEW_Q16 = const(19661)    # 平滑因子 0.7：新点权重 0.3
+_SMOOTH_OLD_Q16 = const(45875)    # 平滑因子 0.7：旧点权重 0.7（越大越平滑）
+
+# 三角函数查找表：一圈 256 等分（约 1.4°，小于输出坐标的 1 像素量化误差），
+# 由 Q16 角度的高 8 位直接索引
+TRIG_LUT_SIZE = 256
+_SIN_LUT = tuple(math.sin(i * TWO_PI / TRIG_LUT_SIZE) for i in range(TRIG_LUT_SIZE))
+_COS_LUT = tuple(math.cos(i * TWO_PI / TRIG_LUT_SIZE) for i in range(TRIG_LUT_SIZE))
 
 # 椭圆参数
 ellipse_a = None      # 椭圆长轴
 ellipse_b = None      # 椭圆短轴
 ellipse_angle = 0     # 椭圆旋转角度
 
+# 旋转角三角函数缓存（旋转角仅在椭圆参数变化时改变）
+_last_rotation = None
+_cos_rot = 1.0
+_sin_rot = 0.0
+
+# 调试画面叠加：仅在 OpenMV IDE 中可见，比赛脱机运行时设为 False 可省去每帧的绘图开销
+DRAW_OVERLAYS = True
+
+# 内存回收配置
+GC_COLLECT_FRAME_MASK = 31  # 兜底回收周期：每32帧强制回收一次
+
 # ----------------- 3. 定义状态与指令 -----------------
 # 工作状态定义
 STATE_IDLE = 0              # 待机状态
@@ -72,15 +117,17 @@ TARGET_LOCKED_HEADER = b'\x3C\x3B'      # 数据包头
 TARGET_LOCKED_FOOTER = b'\x01\x01'      # 数据包尾
 TARGET_LOCKED_FORMAT = '>H'             # 16位整数包含XY坐标
 
+# 预分配的发送缓冲区：包头 + 2字节坐标 + 包尾，发送时只原地改写坐标字段
+_tx_buf = bytearray(TARGET_LOCKED_HEADER + b'\x00\x00' + TARGET_LOCKED_FOOTER)
+_TX_PAYLOAD_OFFSET = len(TARGET_LOCKED_HEADER)
+
 # ----------------- 5. 辅助函数 -----------------
-def calculate_distance(point1, point2):
-    """计算两点间的欧几里得距离，增加健壮性"""
-    try:
-        if point1 is None or point2 is None:
-            return 0
-        return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
-    except (TypeError, IndexError):
-        return 0
+@micropython.native
+def _d2(point1, point2):
+    """计算两点间距离的平方（native 加速，无开方）"""
+    dx = point1[0] - point2[0]
+    dy = point1[1] - point2[1]
+    return dx * dx + dy * dy
 
 def setup_camera(resolution=ACTIVE_RESOLUTION):
     """配置摄像头进入指定模式和分辨率，返回成功与否"""
@@ -101,16 +148,15 @@ def setup_camera(resolution=ACTIVE_RESOLUTION):
         return False
 
 def find_target_boundary_rect(img):
-    """在图像中寻找黑色边框作为靶纸边界（V1.8 强化版）"""
+    """在图像中寻找黑色边框作为靶纸边界（V2.0 find_rects 版）"""
     try:
-        blobs = img.find_blobs([BLACK_THRESHOLD], pixels_threshold=BINARY_PIXELS_THRESHOLD,
-                               area_threshold=BINARY_AREA_THRESHOLD, merge=True)
-        if not blobs:
+        rects = img.find_rects(threshold=RECT_MAGNITUDE_THRESHOLD)
+        if not rects:
             return None
 
-        candidates = []
-        for blob in blobs:
-            rect_x, rect_y, rect_w, rect_h = blob.rect()
+        best_rect, best_magnitude = None, -1
+        for r in rects:
+            rect_x, rect_y, rect_w, rect_h = r.rect()
             if rect_w == 0 or rect_h == 0: continue
 
             # [鲁棒性强化 V1.8] 增加边缘贴合检查
@@ -119,62 +165,75 @@ def find_target_boundary_rect(img):
                (rect_y + rect_h) >= SCREEN_HEIGHT:
                 continue # 矩形贴边，跳过此候选
 
+            # 面积范围与长宽比检查（沿用 V1.6 的超大候选剔除）
             rect_area = rect_w * rect_h
-            blob_pixels = blob.area()
-
-            # [鲁棒性强化 V1.6] 增加密度检查
-            density = blob_pixels / rect_area if rect_area > 0 else 0
-            is_very_large = rect_area > (SCREEN_WIDTH * SCREEN_HEIGHT * 0.75)
-            if is_very_large and density > 0.6:
+            if rect_area < RECT_AREA_THRESHOLD or rect_area > RECT_AREA_VERY_LARGE:
+                continue
+            if max(rect_w, rect_h) >= 4 * min(rect_w, rect_h):
                 continue
 
-            aspect_ratio = max(rect_w, rect_h) / min(rect_w, rect_h)
-            perimeter = blob.perimeter()
-            shape_factor = (perimeter * perimeter) / (4 * math.pi * blob_pixels) if blob_pixels > 0 else 0
-
-            if aspect_ratio < 4 and rect_area > 1000 and rect_area < (SCREEN_WIDTH * SCREEN_HEIGHT * 0.95) and shape_factor > 1.1:
-                candidates.append((blob, rect_area))
-
-        if not candidates:
-            return None
+            magnitude = r.magnitude()
+            if magnitude > best_magnitude:
+                best_rect, best_magnitude = r, magnitude
 
-        return max(candidates, key=lambda x: x[1])[0]
+        return best_rect
     except Exception as e:
         print(f"寻找边界错误: {e}")
         return None
 
-def get_approximate_corners(boundary_rect):
-    """获取矩形的近似四个角点"""
-    try:
-        if boundary_rect is None: return None
-        x, y, w, h = boundary_rect.rect()
-        return [(x, y), (x+w, y), (x+w, y+h), (x, y+h)]
-    except Exception as e:
-        print(f"获取角点错误: {e}")
-        return None
+def find_target_boundary_rect_cached(img):
+    """带时间降采样的目标检测：目标稳定时在接下来若干帧复用上次的检测结果"""
+    global _cached_rect, _cached_age, _last_detected_rect
+    if _cached_rect is not None and _cached_age < RECT_CACHE_MAX_AGE:
+        _cached_age += 1
+        return _cached_rect
+
+    boundary_rect = find_target_boundary_rect(img)
+    rect = boundary_rect.rect() if boundary_rect else None
+    prev = _last_detected_rect
+    stable = rect is not None and prev is not None and \
+        abs(rect[0] - prev[0]) <= RECT_STABLE_PIXELS and \
+        abs(rect[1] - prev[1]) <= RECT_STABLE_PIXELS and \
+        abs(rect[2] - prev[2]) <= RECT_STABLE_PIXELS and \
+        abs(rect[3] - prev[3]) <= RECT_STABLE_PIXELS
+    _cached_rect = boundary_rect if stable else None
+    _cached_age = 0
+    _last_detected_rect = rect
+    return boundary_rect
+
+def reset_rect_cache():
+    """清空检测结果缓存（切换工作模式时调用）"""
+    global _cached_rect, _cached_age, _last_detected_rect
+    _cached_rect = None
+    _cached_age = 0
+    _last_detected_rect = None
 
 def calculate_perspective_correction(corners):
-    """根据四个角点计算透视校正，返回校正后的中心点"""
+    """根据任意四边形的四个角点计算透视校正，返回校正后的中心点"""
     if corners is None or len(corners) != 4:
-        return SCREEN_CENTER_X, SCREEN_CENTER_Y
-
+        return SCREEN_CENTER
     try:
-        x_sum = sum(corner[0] for corner in corners)
-        y_sum = sum(corner[1] for corner in corners)
-        simple_center_x, simple_center_y = x_sum // 4, y_sum // 4
+        return _perspective_center(corners)
+    except Exception as e:
+        print(f"透视校正计算错误: {e}")
+        return SCREEN_CENTER
 
-        x1, y1 = corners[0]; x2, y2 = corners[2]
-        x3, y3 = corners[1]; x4, y4 = corners[3]
+@micropython.native
+def _perspective_center(corners):
+    """透视校正核心计算：两条对角线交点（native 加速，不含异常处理）"""
+    x_sum = corners[0][0] + corners[1][0] + corners[2][0] + corners[3][0]
+    y_sum = corners[0][1] + corners[1][1] + corners[2][1] + corners[3][1]
+    simple_center_x, simple_center_y = x_sum // 4, y_sum // 4
 
-        d = (x1-x2)*(y3-y4) - (y1-y2)*(x3-x4)
-        if d == 0: return simple_center_x, simple_center_y
+    x1, y1 = corners[0]; x2, y2 = corners[2]
+    x3, y3 = corners[1]; x4, y4 = corners[3]
 
-        px = ((x1*y2-y1*x2)*(x3-x4) - (x1-x2)*(x3*y4-y3*x4)) / d
-        py = ((x1*y2-y1*x2)*(y3-y4) - (y1-y2)*(x3*y4-y3*x4)) / d
-        return int(px), int(py)
-    except Exception as e:
-        print(f"透视校正计算错误: {e}")
-        return simple_center_x, simple_center_y
+    d = (x1-x2)*(y3-y4) - (y1-y2)*(x3-x4)
+    if d == 0: return simple_center_x, simple_center_y
+
+    px = ((x1*y2-y1*x2)*(x3-x4) - (x1-x2)*(x3*y4-y3*x4)) / d
+    py = ((x1*y2-y1*x2)*(y3-y4) - (y1-y2)*(x3*y4-y3*x4)) / d
+    return int(px), int(py)
 
 def calculate_circle_params(rect_width, rect_height):
     """计算圆的参数，使用短边作为参考"""
@@ -189,90 +248,148 @@ def calculate_circle_params(rect_width, rect_height):
         return 30, 20
 
 def calculate_ellipse_params(corners, circle_radius):
-    """根据矩形四角点和基础圆半径计算椭圆参数"""
+    """
+    根据四边形四角点和基础圆半径计算椭圆参数。
+    corners 须为左上起顺时针顺序（左上、右上、右下、左下）：上下边长度差异更大时
+    旋转角为 π/2，否则为 0。
+    """
     if corners is None or len(corners) != 4 or circle_radius is None or circle_radius <= 0:
         return circle_radius, circle_radius, 0
     try:
-        top_edge = calculate_distance(corners[0], corners[1])
-        bottom_edge = calculate_distance(corners[3], corners[2])
-        left_edge = calculate_distance(corners[0], corners[3])
-        right_edge = calculate_distance(corners[1], corners[2])
-        h_max = max(top_edge, bottom_edge)
-        v_max = max(left_edge, right_edge)
-        h_ratio = min(top_edge, bottom_edge) / h_max if h_max > 0 else 1.0
-        v_ratio = min(left_edge, right_edge) / v_max if v_max > 0 else 1.0
-        h_ellipse_ratio = 1 + (1 - max(0.1, h_ratio)) * 1.2
-        v_ellipse_ratio = 1 + (1 - max(0.1, v_ratio)) * 1.2
-        if h_ratio < v_ratio:
-            a, b, rotation = circle_radius, circle_radius / h_ellipse_ratio, math.pi/2
+        # 只用到对边长度之比，比较平方值即可，仅对最终选中的比值开方一次
+        top2 = _d2(corners[0], corners[1])
+        bottom2 = _d2(corners[3], corners[2])
+        left2 = _d2(corners[0], corners[3])
+        right2 = _d2(corners[1], corners[2])
+        h_max2 = max(top2, bottom2)
+        v_max2 = max(left2, right2)
+        h_ratio2 = min(top2, bottom2) / h_max2 if h_max2 > 0 else 1.0
+        v_ratio2 = min(left2, right2) / v_max2 if v_max2 > 0 else 1.0
+        if h_ratio2 < v_ratio2:
+            ratio2, rotation = h_ratio2, PI/2
         else:
-            a, b, rotation = circle_radius, circle_radius / v_ellipse_ratio, 0
+            ratio2, rotation = v_ratio2, 0
+        ellipse_ratio = 1 + (1 - max(0.1, ratio2 ** 0.5)) * 1.2
+        a, b = circle_radius, circle_radius / ellipse_ratio
         return max(1, int(a)), max(1, int(b)), rotation
     except Exception as e:
         print(f"椭圆参数计算错误: {e}")
         return circle_radius, circle_radius, 0
 
 def get_ellipse_point(center_x, center_y, a, b, angle, rotation=0):
-    """计算椭圆上指定角度的点坐标"""
+    """计算椭圆上指定角度（Q16 定点）的点坐标"""
     try:
-        if None in [center_x, center_y, a, b]: return SCREEN_CENTER_X, SCREEN_CENTER_Y
-        a, b = max(1, int(a)), max(1, int(b))
-        x = a * math.cos(angle)
-        y = b * math.sin(angle)
-        rotated_x = x * math.cos(rotation) - y * math.sin(rotation)
-        rotated_y = x * math.sin(rotation) + y * math.cos(rotation)
-        return int(center_x + rotated_x), int(center_y + rotated_y)
+        if None in [center_x, center_y, a, b]: return SCREEN_CENTER
+        return _ellipse_point(center_x, center_y, max(1, int(a)), max(1, int(b)), angle, rotation)
     except Exception as e:
         print(f"椭圆点计算错误: {e}")
         return int(center_x), int(center_y)
 
-def send_target_coords(cx, cy, mode=None, center=None, radius=None, ellipse_params=None):
+@micropython.native
+def _ellipse_point(center_x, center_y, a, b, angle, rotation):
+    """椭圆点核心计算（native 加速，角度查表，旋转角三角函数跨帧缓存）"""
+    global _last_rotation, _cos_rot, _sin_rot
+    if rotation != _last_rotation:
+        _cos_rot = math.cos(rotation)
+        _sin_rot = math.sin(rotation)
+        _last_rotation = rotation
+    cr = _cos_rot; sr = _sin_rot
+    idx = ((angle + 128) >> 8) & (TRIG_LUT_SIZE - 1)
+    ca = _COS_LUT[idx]; sa = _SIN_LUT[idx]
+    x = a * ca
+    y = b * sa
+    return int(center_x + x * cr - y * sr), int(center_y + x * sr + y * cr)
+
+@micropython.viper
+def _pack_xy(x: int, y: int) -> int:
+    """将坐标钳位到0~255并打包为16位整数 (x << 8) | y（viper 加速）"""
+    if x < 0: x = 0
+    elif x > 255: x = 255
+    if y < 0: y = 0
+    elif y > 255: y = 255
+    return (x << 8) | y
+
+@micropython.viper
+def _advance_angle(cur: int, ideal: int) -> int:
+    """Q16 角度按增益 0.3 向理想角度逼近，误差取最短方向（viper 定点运算）"""
+    diff = ((ideal - cur + _ANGLE_Q16_HALF_TURN) & _ANGLE_Q16_MASK) - _ANGLE_Q16_HALF_TURN
+    return (cur + ((diff * _ANGLE_GAIN_Q16) >> 16)) & _ANGLE_Q16_MASK
+
+@micropython.viper
+def _smooth_coord(target: int, last: int) -> int:
+    """坐标指数平滑（viper 定点运算）"""
+    return (target * _SMOOTH_NEW_Q16 + last * _SMOOTH_OLD_Q16) >> 16
+
+def _send_ready(current_time):
+    """发送门控：时间间隔已到，且串口上一帧已发完（不阻塞等待，未发完则留待下一帧）"""
+    if time.ticks_diff(current_time, last_uart_send_time) < current_send_interval_ms:
+        return False
+    return _uart_txdone is None or _uart_txdone()
+
+def _write_coords(x, y, current_time):
+    """将图像坐标换算到串口协议坐标系，打包后写入串口并记录发送时间与发送坐标"""
+    global last_uart_send_time, last_sent_coord
+    combined_coord = _pack_xy(x * OUTPUT_WIDTH // SCREEN_WIDTH,
+                              y * OUTPUT_HEIGHT // SCREEN_HEIGHT)
+    struct.pack_into(TARGET_LOCKED_FORMAT, _tx_buf, _TX_PAYLOAD_OFFSET, combined_coord)
+    uart.write(_tx_buf)
+    last_uart_send_time = current_time
+    last_sent_coord = combined_coord
+
+def send_aim_coords(cx, cy):
     """
-    发送坐标到单片机。
-    成功发送则返回一个包含(x, y)坐标的元组。
-    如果因时间间隔未到而未发送，则返回(None, None)。
+    瞄准靶心模式：发送靶心坐标到单片机。
+    成功发送则返回一个包含图像坐标系下(x, y)坐标的元组。
+    如果因时间间隔未到或串口仍在发送而未发送，则返回(None, None)。
     """
-    global last_uart_send_time, current_angle, circle_start_time, last_target_point
     try:
         current_time = time.ticks_ms()
-        if time.ticks_diff(current_time, last_uart_send_time) < current_send_interval_ms:
+        if not _send_ready(current_time):
             return None, None
 
-        if mode == "circle" and center is not None and radius is not None:
-            center_x, center_y = center
-            if circle_start_time is None:
-                circle_start_time = time.ticks_ms()
-                current_angle = 0
-            elapsed_time = time.ticks_diff(time.ticks_ms(), circle_start_time)
-            ideal_angle = (elapsed_time % target_circle_time) / target_circle_time * 2 * math.pi
-            angle_diff = ideal_angle - current_angle
-            if angle_diff > math.pi: angle_diff -= 2 * math.pi
-            elif angle_diff < -math.pi: angle_diff += 2 * math.pi
-            current_angle = (current_angle + angle_diff * 0.3) % (2 * math.pi)
-            if ellipse_params is None or None in ellipse_params:
-                ellipse_params = (radius, radius, 0)
-            a, b, rotation = ellipse_params
-            target_x, target_y = get_ellipse_point(center_x, center_y, a, b, current_angle, rotation)
-            if last_target_point:
-                target_x = int(target_x * (1-smooth_factor) + last_target_point[0] * smooth_factor)
-                target_y = int(target_y * (1-smooth_factor) + last_target_point[1] * smooth_factor)
-            last_target_point = (target_x, target_y)
-            final_x, final_y = min(255, max(0, target_x)), min(255, max(0, target_y))
-        else:
-            if cx is None or cy is None: cx, cy = SCREEN_CENTER_X, SCREEN_CENTER_Y
-            final_x, final_y = min(255, max(0, int(cx))), min(255, max(0, int(cy)))
-            circle_start_time = None
-            last_target_point = None
-
-        combined_coord = (final_x << 8) | final_y
-        payload = struct.pack(TARGET_LOCKED_FORMAT, combined_coord)
-        uart.write(TARGET_LOCKED_HEADER + payload + TARGET_LOCKED_FOOTER)
-        last_uart_send_time = current_time
+        if cx is None or cy is None: cx, cy = SCREEN_CENTER
+        final_x, final_y = int(cx), int(cy)
+        _write_coords(final_x, final_y, current_time)
         return final_x, final_y
     except Exception as e:
         print(f"发送坐标错误: {e}")
         return None, None
 
+def send_circle_coords(center, radius, ellipse_params=None):
+    """
+    圆追踪模式：沿椭圆轨迹计算下一个目标点并发送到单片机。
+    返回值约定同 send_aim_coords。圆周状态在切换到本模式时由主循环复位。
+    """
+    global current_angle, circle_start_time, last_target_point
+    try:
+        current_time = time.ticks_ms()
+        if not _send_ready(current_time):
+            return None, None
+        if center is None or radius is None:
+            return None, None
+
+        center_x, center_y = center
+        if circle_start_time is None:
+            circle_start_time = current_time
+            current_angle = 0
+        elapsed_time = time.ticks_diff(current_time, circle_start_time)
+        ideal_angle = ((elapsed_time % target_circle_time) * _ANGLE_Q16_PER_MS_Q12) >> 12
+        current_angle = _advance_angle(current_angle, ideal_angle)
+        if ellipse_params is None or None in ellipse_params:
+            ellipse_params = (radius, radius, 0)
+        a, b, rotation = ellipse_params
+        target_x, target_y = get_ellipse_point(center_x, center_y, a, b, current_angle, rotation)
+        if last_target_point:
+            target_x = _smooth_coord(target_x, last_target_point[0])
+            target_y = _smooth_coord(target_y, last_target_point[1])
+        last_target_point = (target_x, target_y)
+
+        _write_coords(target_x, target_y, current_time)
+        return target_x, target_y
+    except Exception as e:
+        print(f"发送坐标错误: {e}")
+        return None, None
+
 def set_send_interval_for_mode(mode):
     """根据不同的工作模式设置相应的发送间隔"""
     global current_send_interval_ms
@@ -284,13 +401,11 @@ def set_send_interval_for_mode(mode):
 
 
 def clear_uart_buffer():
-    """清空串口接收缓冲区，增加超时保护"""
-    clear_start_time = time.ticks_ms()
-    while uart.any():
-        uart.read()
-        if time.ticks_diff(time.ticks_ms(), clear_start_time) > 200:
-            print("!!! 清空缓冲区超时 !!!")
-            break
+    """清空串口接收缓冲区：按已缓存的字节数一次读出，不在Python层循环轮询"""
+    # 指定长度读取在取满后立即返回，不会像无参 read() 那样再等待 timeout_char
+    pending = uart.any()
+    if pending:
+        uart.read(pending)
 
 # ==================================================================================
 # === 主程序 ===
@@ -301,7 +416,7 @@ if __name__ == "__main__":
     frame_count = 0
 
     print("\n" + "="*50)
-    print(f"=== OpenMV 自行瞄准装置视觉控制程序 V1.9 ===")
+    print(f"=== OpenMV 自行瞄准装置视觉控制程序 V2.0 ===")
     print(f"    分辨率: {SCREEN_WIDTH}x{SCREEN_HEIGHT} | 作者: Viny")
     print("="*50)
     print("系统已启动，正在初始化摄像头...")
@@ -311,6 +426,10 @@ if __name__ == "__main__":
         print("!!! 摄像头初始化失败，请检查连接后重启设备 !!!")
         while True: time.sleep_ms(1000)
 
+    # 以阈值触发自动回收，代替每帧手动 gc.collect()
+    gc.collect()
+    gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+
     print("\n--- 可用串口指令 ---")
     for cmd, desc in COMMAND_MAP.items():
         print(f"  指令 {cmd.hex().upper()}: {desc}")
@@ -318,27 +437,36 @@ if __name__ == "__main__":
 
     clear_uart_buffer()
 
+    # 循环内高频调用的方法预先绑定为局部名，省去每帧的属性查找
+    uart_any = uart.any
+    uart_read = uart.read
+    snapshot = sensor.snapshot
+    sleep_ms = time.sleep_ms
+
     while True:
         try:
             # [鲁棒性] 检查摄像头状态
             if not camera_ok:
                 print("检测到摄像头错误，尝试在1秒后重新初始化...")
-                time.sleep_ms(1000)
+                sleep_ms(1000)
                 camera_ok = setup_camera()
                 continue
 
             # ----------------- 串口通信处理优先 -----------------
-            if uart.any():
-                command = uart.read(1)
+            if uart_any():
+                command = uart_read(1)
                 clear_uart_buffer()
 
                 if command in COMMAND_MAP:
                     cmd_desc = COMMAND_MAP[command]
                     print(f"\n>>> 收到指令: {command.hex().upper()} ({cmd_desc}) <<<")
+                    reset_rect_cache()
 
                     if command == CMD_AIM_BULLSEYE:
                         current_state = STATE_AIM_BULLSEYE
                         set_send_interval_for_mode(STATE_AIM_BULLSEYE)
+                        circle_start_time = None
+                        last_target_point = None
                     elif command == CMD_CIRCLE_TRACKING:
                         current_state = STATE_CIRCLE_TRACKING
                         set_send_interval_for_mode(STATE_CIRCLE_TRACKING)
@@ -349,73 +477,80 @@ if __name__ == "__main__":
                         current_state = STATE_IDLE
                         print("返回待机模式")
 
-                    time.sleep_ms(1)
+                    sleep_ms(1)
                     continue
 
             # ----------------- 状态机执行 -----------------
             if current_state == STATE_IDLE:
-                time.sleep_ms(50)
+                sleep_ms(50)
                 continue
 
             frame_count += 1
             should_print = (frame_count % print_interval == 0)
 
-            img = sensor.snapshot()
-            boundary_rect = find_target_boundary_rect(img)
-            source_method = "Blob"
+            img = snapshot()
+            boundary_rect = find_target_boundary_rect_cached(img)
+            source_method = "Rects"
 
             if not boundary_rect:
                 if should_print: print(f"  > [{COMMAND_MAP.get(CMD_AIM_BULLSEYE if current_state == STATE_AIM_BULLSEYE else CMD_CIRCLE_TRACKING, '未知')}] 未找到目标")
             else:
-                corners = get_approximate_corners(boundary_rect)
-                if corners:
-                    corrected_cx, corrected_cy = calculate_perspective_correction(corners)
-                    rect_w, rect_h = boundary_rect.rect()[2], boundary_rect.rect()[3]
-
-                    # --- [逻辑修正 V1.9] 核心修改点 ---
-                    # 无论是否发送UART，只要找到目标就进行绘制，提供即时视觉反馈。
-
-                    if current_state == STATE_AIM_BULLSEYE:
-                        # 1. 总是绘制视觉反馈
-                        img.draw_rectangle(boundary_rect.rect(), color=255, thickness=2)
+                rect = boundary_rect.rect()
+                # find_rects 的 corners() 自左下角起顺时针，轮换为左上起顺时针，
+                # 与 calculate_ellipse_params 的上/下/左/右边约定一致
+                c = boundary_rect.corners()
+                corners = (c[1], c[2], c[3], c[0])
+                corrected_cx, corrected_cy = calculate_perspective_correction(corners)
+                rect_w, rect_h = rect[2], rect[3]
+
+                # --- [逻辑修正 V1.9] 核心修改点 ---
+                # 无论是否发送UART，只要找到目标就进行绘制，提供即时视觉反馈。
+                # （DRAW_OVERLAYS 关闭时跳过全部绘制）
+
+                if current_state == STATE_AIM_BULLSEYE:
+                    # 1. 总是绘制视觉反馈
+                    if DRAW_OVERLAYS:
+                        img.draw_rectangle(rect, color=255, thickness=2)
                         img.draw_cross(corrected_cx, corrected_cy, color=255, size=3)
 
-                        # 2. 尝试发送坐标（受时间门控）
-                        result = send_target_coords(corrected_cx, corrected_cy)
+                    # 2. 尝试发送坐标（受时间门控）
+                    result = send_aim_coords(corrected_cx, corrected_cy)
 
-                        # 3. 如果发送成功，则打印信息
-                        if result and result[0] is not None:
-                            if should_print:
-                                print(f"  > [瞄准] 成功! 方法:{source_method}. 发送:({result[0]},{result[1]})")
+                    # 3. 如果发送成功，则打印信息
+                    if result and result[0] is not None:
+                        if should_print:
+                            print(f"  > [瞄准] 成功! 方法:{source_method}. 发送:({last_sent_coord >> 8},{last_sent_coord & 0xFF})")
 
-                    elif current_state == STATE_CIRCLE_TRACKING:
-                        # 1. 计算参数
-                        _, r_6cm = calculate_circle_params(rect_w, rect_h)
-                        ellipse_params = calculate_ellipse_params(corners, r_6cm)
+                elif current_state == STATE_CIRCLE_TRACKING:
+                    # 1. 计算参数
+                    _, r_6cm = calculate_circle_params(rect_w, rect_h)
+                    ellipse_params = calculate_ellipse_params(corners, r_6cm)
 
-                        # 2. 总是绘制静态视觉反馈
-                        img.draw_rectangle(boundary_rect.rect(), color=255, thickness=2)
+                    # 2. 总是绘制静态视觉反馈
+                    if DRAW_OVERLAYS:
+                        img.draw_rectangle(rect, color=255, thickness=2)
                         img.draw_cross(corrected_cx, corrected_cy, color=255, size=3)
                         img.draw_circle(corrected_cx, corrected_cy, r_6cm, color=255, thickness=1)
 
-                        # 3. 尝试发送坐标（受时间门控）
-                        result = send_target_coords(0, 0, mode="circle", center=(corrected_cx, corrected_cy),
-                                                    radius=r_6cm, ellipse_params=ellipse_params)
+                    # 3. 尝试发送坐标（受时间门控）
+                    result = send_circle_coords((corrected_cx, corrected_cy), r_6cm, ellipse_params)
 
-                        # 4. 如果发送成功，绘制动态点并打印信息
-                        if result and result[0] is not None:
-                            target_x, target_y = result
+                    # 4. 如果发送成功，绘制动态点并打印信息
+                    if result and result[0] is not None:
+                        target_x, target_y = result
+                        if DRAW_OVERLAYS:
                             img.draw_cross(target_x, target_y, color=128, size=3)
-                            if should_print:
-                                angle_deg = int(current_angle * 180 / math.pi)
-                                print(f"  > [追踪] R:{r_6cm} | 点:({target_x},{target_y}) @{angle_deg}°")
+                        if should_print:
+                            angle_deg = (current_angle * 360) >> 16
+                            print(f"  > [追踪] R:{r_6cm} | 点:({target_x},{target_y}) 发送:({last_sent_coord >> 8},{last_sent_coord & 0xFF}) @{angle_deg}°")
 
-            gc.collect()
-            time.sleep_ms(1)
+            if (frame_count & GC_COLLECT_FRAME_MASK) == 0:
+                gc.collect()
+            sleep_ms(1)
 
         except Exception as e:
             print(f"!!! 主循环发生严重错误: {type(e).__name__}: {e} !!!")
             if "sensor" in str(e).lower() or "snapshot" in str(e).lower():
                 camera_ok = False
                 print("错误可能与摄像头有关，将尝试在下一周期恢复。")
-            time.sleep_ms(500)
+            sleep_ms(500)